@@ -1,17 +1,52 @@
 #!/usr/bin/env python3
 
 import argparse
+import functools
 import os
+import re
 import sys
 import textwrap
 import unicodedata
 
 import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib import font_manager as fm
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import LineCollection
+from matplotlib.patches import FancyArrowPatch
 from matplotlib.textpath import TextPath
 
+# Single-pass separator folding tables (legacy flow arrows, inline separators)
+_LEGACY_ARROWS = str.maketrans({"→": ">", "－": ">", "—": ">"})
+_INLINE_SEPS = str.maketrans({"→": "/", ">": "/"})
+
+# Inline-labeled tokens: a separator (group 1) or a segment body (group 2)
+_INLINE_TOKEN_RE = re.compile(r"(//|[/|])|([^/|]+)")
+
+# Legacy CSV lines carry at least two commas; matching stops at the second one
+_LEGACY_RE = re.compile(r"[^,]*,[^,]*,")
+
+# Lane role codes and the legacy-format aliases that map onto them
+_ALLOWED_ROLES = frozenset("CFBP")
+_ROLE_NORM = {
+    "C": "C",
+    "F": "F",
+    "B": "B",
+    "P": "P",
+    "FRONT": "F",
+    "FRONTSTAGE": "F",
+    "BACK": "B",
+    "BACKSTAGE": "B",
+    "CUSTOMER": "C",
+    "CLIENT": "C",
+    "CUST": "C",
+    "SUPPORT": "P",
+    "SUP": "P",
+    "PROCESS": "P",
+    "PROC": "P",
+}
+
 
 def _parse_legacy(line: str):
     parts = [p.strip() for p in line.split(",", 2)]
@@ -22,37 +57,21 @@ def _parse_legacy(line: str):
     # Normalize arrows to '>'
     flow_tokens = [
         token.strip()
-        for token in flow.replace("→", ">").replace("－", ">").replace("—", ">").split(">")
+        for token in flow.translate(_LEGACY_ARROWS).split(">")
         if token.strip()
     ]
-    norm = {
-        "C": "C",
-        "F": "F",
-        "B": "B",
-        "P": "P",
-        "FRONT": "F",
-        "FRONTSTAGE": "F",
-        "BACK": "B",
-        "BACKSTAGE": "B",
-        "CUSTOMER": "C",
-        "CLIENT": "C",
-        "CUST": "C",
-        "SUPPORT": "P",
-        "SUP": "P",
-        "PROCESS": "P",
-        "PROC": "P",
-    }
-    allowed_roles = {"C", "F", "B", "P"}
     flow_seq = []
     for token in flow_tokens:
         key = token.upper()
-        code = norm.get(key)
+        code = _ROLE_NORM.get(key)
         if code is None and key:
-            code = norm.get(key[0])
+            code = _ROLE_NORM.get(key[0])
         if code is None and key:
             code = key[0]
-        if code not in allowed_roles:
-            raise ValueError(f"Unsupported flow code '{token}' (expected one of {sorted(allowed_roles)})")
+        if code not in _ALLOWED_ROLES:
+            raise ValueError(
+                f"Unsupported flow code '{token}' (expected one of {sorted(_ALLOWED_ROLES)})"
+            )
         flow_seq.append(code)
 
     act_seq = actions.replace("→", ">").split(">")
@@ -67,8 +86,10 @@ def _parse_legacy(line: str):
 
 
 def _parse_inline_labeled(line: str):
-    # Normalize full-width forms and arrows
-    line = unicodedata.normalize("NFKC", line)
+    # Normalize full-width forms and arrows (ASCII is already NFKC-invariant)
+    is_ascii = line.isascii()
+    if not is_ascii:
+        line = unicodedata.normalize("NFKC", line)
     # Split into step and the labeled sequence by first whitespace
     if not line.strip():
         raise ValueError("Empty line")
@@ -84,42 +105,36 @@ def _parse_inline_labeled(line: str):
                 "Inline-labeled format requires 'Step:FAction/...' または 'Step FAction/...'"
             )
         step, labeled = parts
-    # Use '/' or '>' or '→' as separators
-    labeled = labeled.replace("→", "/").replace(">", "/")
+    # Use '/' or '>' or '→' as separators ('→' cannot occur in ASCII input)
+    if is_ascii:
+        labeled = labeled.replace(">", "/")
+    else:
+        labeled = labeled.translate(_INLINE_SEPS)
 
+    # Tokenize into separators ('//', '/', '|') and segment bodies in one regex pass
     segments = []
     separators = []
-    buf = []
-    i = 0
-    while i < len(labeled):
-        ch = labeled[i]
-        if ch == "/" or ch == "|":
-            next_is_slash = i + 1 < len(labeled) and labeled[i + 1] == "/"
-            segment = "".join(buf).strip()
-            if not segment:
-                raise ValueError("Missing role/action between separators in inline-labeled input")
-            segments.append(segment)
-            if ch == "|":
-                separators.append("|")
-                buf = []
-                i += 1
-                continue
-            separators.append("//" if next_is_slash else "/")
-            buf = []
-            i += 2 if next_is_slash else 1
+    pending = ""
+    for sep, body in _INLINE_TOKEN_RE.findall(labeled):
+        if body:
+            pending = body.strip()
             continue
-        buf.append(ch)
-        i += 1
-    tail = "".join(buf).strip()
-    if not tail:
+        if not pending:
+            raise ValueError(
+                "Missing role/action between separators in inline-labeled input"
+            )
+        segments.append(pending)
+        separators.append(sep)
+        pending = ""
+    if not pending:
         raise ValueError("Inline-labeled input must end with a role/action segment")
-    segments.append(tail)
+    segments.append(pending)
 
     parsed_segments = []
     for seg in segments:
         # Expect leading C/F/B/P (case-insensitive) then the action label
         role = seg[0].upper()
-        if role not in {"C", "F", "B", "P"}:
+        if role not in _ALLOWED_ROLES:
             raise ValueError(f"Invalid role prefix in segment: '{seg}' (expected C/F/B/P)")
         action = seg[1:].strip()
         parsed_segments.append((role, action))
@@ -144,8 +159,7 @@ def _parse_inline_labeled(line: str):
 def parse_line(line: str):
     # Heuristic: if the line contains two commas, treat as legacy CSV.
     # Otherwise, parse as inline-labeled.
-    comma_count = line.count(",")
-    if comma_count >= 2:
+    if _LEGACY_RE.match(line):
         try:
             return _parse_legacy(line)
         except Exception:
@@ -154,87 +168,188 @@ def parse_line(line: str):
     return _parse_inline_labeled(line)
 
 
-def draw_page(pdf, step, flow_seq, act_seq, edges, font_prop=None):
-    lanes = [("Customer", "C"), ("Front", "F"), ("Back", "B"), ("Process", "P")]
-    lane_base_y = {"C": 3.0, "F": 2.2, "B": 1.4, "P": 0.6}
+# Lane labels (top to bottom) and their role codes; identical on every page
+_LANES = (("Customer", "C"), ("Front", "F"), ("Back", "B"), ("Process", "P"))
+_LANE_LABEL_SIZE = 12
+
+
+def _sized_fontprop(font_prop, size: float) -> fm.FontProperties:
+    prop = font_prop.copy() if font_prop is not None else fm.FontProperties()
+    prop.set_size(size)
+    return prop
 
-    n = len(flow_seq)
 
-    # Physical dimensions (A4 landscape) and target margins [mm]
-    page_width_mm = 297.0
-    page_height_mm = 210.0
-    margin_mm = 10.0
-    content_width_mm = page_width_mm - 2 * margin_mm
-    content_height_mm = page_height_mm - 2 * margin_mm
-
-    # Figure setup aligned to 10mm margins on all sides
-    fig = plt.figure(
-        figsize=(page_width_mm / 25.4, page_height_mm / 25.4)
-    )  # Convert mm -> inch
+# Measured text widths keyed by text, the font file the properties resolve to
+# (findfont reads the current rc family lists), the remaining style fields and
+# the size; kept for the whole run so repeated labels only build a TextPath once.
+_TEXT_WIDTH_CACHE: dict = {}
+
+
+def _text_width_mm(text: str, font_prop, size: float) -> float:
+    if font_prop is None:
+        font_prop = fm.FontProperties()
+    key = (
+        text,
+        fm.findfont(font_prop),
+        font_prop.get_style(),
+        font_prop.get_variant(),
+        font_prop.get_weight(),
+        font_prop.get_stretch(),
+        font_prop.get_math_fontfamily(),
+        size,
+    )
+    width_mm = _TEXT_WIDTH_CACHE.get(key)
+    if width_mm is not None:
+        return width_mm
+    prop = _sized_fontprop(font_prop, size)
+    try:
+        path = TextPath((0, 0), text, prop=prop)
+        width_points = path.get_extents().width
+    except Exception:
+        width_points = size * max(len(text), 1) * 0.6
+    width_mm = _TEXT_WIDTH_CACHE[key] = width_points * 25.4 / 72.0
+    return width_mm
+
+
+_ACTION_WRAPPER = textwrap.TextWrapper(width=14)
+
+
+@functools.lru_cache(maxsize=1024)
+def _wrap_action(act: str) -> str:
+    return _ACTION_WRAPPER.fill(act)
+
+
+def _max_lane_label_width_mm(font_prop) -> float:
+    return max(
+        (_text_width_mm(label, font_prop, _LANE_LABEL_SIZE) for label, _ in _LANES),
+        default=0.0,
+    )
+
+
+# Physical dimensions (A4 landscape) and target margins [mm]
+_PAGE_WIDTH_MM = 297.0
+_PAGE_HEIGHT_MM = 210.0
+_MARGIN_MM = 10.0
+_CONTENT_WIDTH_MM = _PAGE_WIDTH_MM - 2 * _MARGIN_MM
+_CONTENT_HEIGHT_MM = _PAGE_HEIGHT_MM - 2 * _MARGIN_MM
+
+# Map legacy vertical coordinates into physical mm space.
+_LEGACY_BOTTOM = 0.6
+_LEGACY_TOP = 4.0
+_TOP_PADDING_MM = 3.0
+_BOTTOM_PADDING_MM = 3.0
+_SCALE_Y = (_CONTENT_HEIGHT_MM - _TOP_PADDING_MM - _BOTTOM_PADDING_MM) / (
+    _LEGACY_TOP - _LEGACY_BOTTOM
+)
+_OFFSET_Y = _BOTTOM_PADDING_MM - _SCALE_Y * _LEGACY_BOTTOM
+
+
+def _map_y(val: float) -> float:
+    return _SCALE_Y * val + _OFFSET_Y
+
+
+# Page-invariant vertical positions [mm]
+_TITLE_Y = _map_y(4.0)
+_RECAP_Y = _map_y(3.7)
+_LANE_Y = {
+    code: _map_y(val) for code, val in {"C": 3.0, "F": 2.2, "B": 1.4, "P": 0.6}.items()
+}
+
+
+# "->" arrow geometry reproducing ArrowStyle.CurveB as annotate draws it: 10 pt
+# mutation scale (head_length 0.4, head_width 0.2), 2 pt shrink at both ends,
+# 1 pt round-capped/joined lines. Axes data units are millimetres on both axes.
+_PT_TO_MM = 25.4 / 72.0
+_ARROW_LINEWIDTH_PT = 1.0
+_ARROW_SHRINK_MM = 2.0 * _PT_TO_MM
+# Each head stroke is head_dist long at angle t from the shaft, with
+# head_dist = hypot(head_length, head_width) and (cos t, sin t) taken from them.
+_ARROW_HEAD_DIST_PT = float(np.hypot(4.0, 2.0))
+_ARROW_HEAD_COS = 4.0 / _ARROW_HEAD_DIST_PT
+_ARROW_HEAD_SIN = 2.0 / _ARROW_HEAD_DIST_PT
+_ARROW_HEAD_ALONG_MM = _ARROW_HEAD_DIST_PT * _ARROW_HEAD_COS * _PT_TO_MM
+_ARROW_HEAD_ACROSS_MM = _ARROW_HEAD_DIST_PT * _ARROW_HEAD_SIN * _PT_TO_MM
+# CurveB pulls the tip back so the stroked wedge does not overshoot the end point
+_ARROW_TIP_PAD_MM = 0.5 * _ARROW_LINEWIDTH_PT / _ARROW_HEAD_SIN * _PT_TO_MM
+
+
+def _straight_arrow_segments(starts, ends):
+    # Per arrow: the shaft (2 vertices) and the head as one polyline (3 vertices)
+    vec = ends - starts
+    length = np.hypot(vec[:, 0], vec[:, 1])[:, None]
+    unit = vec / np.where(length > 0.0, length, 1.0)
+    normal = unit[:, ::-1] * (-1.0, 1.0)
+    tail = starts + unit * _ARROW_SHRINK_MM
+    tip = ends - unit * (_ARROW_SHRINK_MM + _ARROW_TIP_PAD_MM)
+    head_base = tip - unit * _ARROW_HEAD_ALONG_MM
+    shafts = np.stack([tail, tip], axis=1)
+    heads = np.stack(
+        [
+            head_base + normal * _ARROW_HEAD_ACROSS_MM,
+            tip,
+            head_base - normal * _ARROW_HEAD_ACROSS_MM,
+        ],
+        axis=1,
+    )
+    return list(shafts) + list(heads)
+
+
+def _edge_connection_rads(starts, ends, sy, ey):
+    # Adjacent nodes on different lanes: straight arrow (batched by the caller).
+    # Adjacent nodes on the same lane: arc3 rad=0.2. Longer hops ('//' branches):
+    # rad=0.25 when the target lane is the same or higher on the page, else -0.25.
+    adjacent = ends - starts <= 1
+    same_lane = np.abs(sy - ey) <= 1e-6
+    straight = adjacent & ~same_lane
+    rads = np.where(adjacent & same_lane, 0.2, np.where(sy <= ey, 0.25, -0.25))
+    return straight, rads
+
+
+def _new_page_figure():
+    # Figure setup aligned to 10mm margins on all sides; reused for every page
+    # No layout engine: the fixed margins below must survive every savefig
+    fig, ax = plt.subplots(
+        figsize=(_PAGE_WIDTH_MM / 25.4, _PAGE_HEIGHT_MM / 25.4),  # Convert mm -> inch
+        layout="none",
+    )
     fig.subplots_adjust(
-        left=margin_mm / page_width_mm,
-        right=1 - margin_mm / page_width_mm,
-        bottom=margin_mm / page_height_mm,
-        top=1 - margin_mm / page_height_mm,
+        left=_MARGIN_MM / _PAGE_WIDTH_MM,
+        right=1 - _MARGIN_MM / _PAGE_WIDTH_MM,
+        bottom=_MARGIN_MM / _PAGE_HEIGHT_MM,
+        top=1 - _MARGIN_MM / _PAGE_HEIGHT_MM,
     )
-    ax = fig.add_subplot(111)
-    ax.set_xlim(0.0, content_width_mm)
-    ax.set_ylim(0.0, content_height_mm)
     ax.axis("off")
+    return fig, ax
 
-    # Map legacy vertical coordinates into physical mm space.
-    legacy_bottom = 0.6
-    legacy_top = 4.0
-    top_padding_mm = 3.0
-    bottom_padding_mm = 3.0
-    usable_height_mm = content_height_mm - top_padding_mm - bottom_padding_mm
-    scale_y = usable_height_mm / (legacy_top - legacy_bottom)
-    offset_y = bottom_padding_mm - scale_y * legacy_bottom
 
-    def map_y(val: float) -> float:
-        return scale_y * val + offset_y
+def draw_page(pdf, ax, step, flow_seq, act_seq, edges, font_prop=None):
+    n = len(flow_seq)
 
-    title_y = map_y(4.0)
-    recap_y = map_y(3.7)
-    lane_y = {code: map_y(val) for code, val in lane_base_y.items()}
+    # Reset the shared axes left over from the previous page
+    ax.clear()
+    ax.set_xlim(0.0, _CONTENT_WIDTH_MM)
+    ax.set_ylim(0.0, _CONTENT_HEIGHT_MM)
+    ax.axis("off")
 
     # Horizontal span (place lane labels near left edge, points across full width)
     lane_label_x = 0.0
     lane_label_offset_mm = 0.0
     action_label_offset_mm = 6.0
 
-    def _text_width_mm(text: str, font_prop_candidate: fm.FontProperties, size: float) -> float:
-        prop = font_prop_candidate.copy() if font_prop_candidate is not None else fm.FontProperties()
-        prop.set_size(size)
-        try:
-            path = TextPath((0, 0), text, prop=prop)
-            width_points = path.get_extents().width
-        except Exception:
-            width_points = size * max(len(text), 1) * 0.6
-        return width_points * 25.4 / 72.0
-
-    lane_label_prop = font_prop.copy() if font_prop is not None else fm.FontProperties()
-    lane_label_prop.set_size(12)
-    max_label_width_mm = max(
-        (_text_width_mm(label, lane_label_prop, 12) for label, _ in lanes),
-        default=0.0,
-    )
+    max_label_width_mm = _max_lane_label_width_mm(font_prop)
 
     lane_left_mm = lane_label_x + max_label_width_mm + 10.0
-    lane_right_mm = content_width_mm
+    lane_right_mm = _CONTENT_WIDTH_MM
 
-    if n == 0:
-        xs = []
-    elif n == 1:
-        xs = [(lane_left_mm + lane_right_mm) / 2]
+    if n == 1:
+        node_x = np.array([(lane_left_mm + lane_right_mm) / 2])
     else:
-        spacing = (lane_right_mm - lane_left_mm) / (n - 1)
-        xs = [lane_left_mm + i * spacing for i in range(n)]
+        node_x = np.linspace(lane_left_mm, lane_right_mm, n)
 
     # Title
     ax.text(
         0.0,
-        title_y,
+        _TITLE_Y,
         f"Step: {step}",
         fontsize=16,
         ha="left",
@@ -243,14 +358,10 @@ def draw_page(pdf, step, flow_seq, act_seq, edges, font_prop=None):
     )
 
     # Recap in inline-labeled style (e.g., Fアクション / Bアクション / Sアクション)
-    segments = []
-    for r, a in zip(flow_seq, act_seq):
-        label = f"{r} {a}" if a else r
-        segments.append(label)
-    recap = " / ".join(segments)
+    recap = " / ".join([f"{r} {a}" if a else r for r, a in zip(flow_seq, act_seq)])
     ax.text(
         0.0,
-        recap_y,
+        _RECAP_Y,
         recap,
         fontsize=10,
         ha="left",
@@ -259,29 +370,34 @@ def draw_page(pdf, step, flow_seq, act_seq, edges, font_prop=None):
     )
 
     # Lanes
-    for label, code in lanes:
-        y = lane_y[code]
+    for label, code in _LANES:
+        y = _LANE_Y[code]
         ax.hlines(y, lane_left_mm, lane_right_mm, linewidth=1, color="#1f77b4")
         ax.text(
             lane_label_x,
             y + lane_label_offset_mm,
             label,
-            fontsize=12,
+            fontsize=_LANE_LABEL_SIZE,
             ha="left",
             va="center",
             fontproperties=font_prop,
         )
 
-    # Points and arrows
-    node_positions = {}
-    for idx, (x, role, act) in enumerate(zip(xs, flow_seq, act_seq)):
-        y = lane_y.get(role, 0.0)
-        node_x = x
-        node_positions[idx] = (node_x, y)
-        ax.plot([node_x], [y], marker="o")
-        wrapped = textwrap.fill(act, width=14)
-        ax.text(
+    # Points and arrows (node coordinates kept as flat arrays indexed by node)
+    node_y = np.array([_LANE_Y.get(role, 0.0) for role in flow_seq], dtype=float)
+    if n:
+        # One artist for all nodes; "C{i}" keeps the per-node colour cycle
+        ax.scatter(
             node_x,
+            node_y,
+            c=[f"C{i}" for i in range(n)],
+            marker="o",
+            zorder=2,
+        )
+    for x, y, act in zip(node_x, node_y, act_seq):
+        wrapped = _wrap_action(act)
+        ax.text(
+            x,
             y + action_label_offset_mm,
             wrapped,
             fontsize=9,
@@ -290,29 +406,61 @@ def draw_page(pdf, step, flow_seq, act_seq, edges, font_prop=None):
             fontproperties=font_prop,
         )
 
-    def _connection_style(start_idx: int, end_idx: int, sy: float, ey: float) -> str:
-        if end_idx - start_idx <= 1 and abs(sy - ey) > 1e-6:
-            return "arc3,rad=0.0"
-        if end_idx - start_idx <= 1 and abs(sy - ey) <= 1e-6:
-            return "arc3,rad=0.2"
-        rad = 0.25 if sy <= ey else -0.25
-        return f"arc3,rad={rad}"
+    edge_idx = np.array(edges, dtype=int).reshape(-1, 2)
+    edge_idx = edge_idx[(edge_idx < n).all(axis=1)]
+    starts = edge_idx[:, 0]
+    ends = edge_idx[:, 1]
+    sy = node_y[starts]
+    ey = node_y[ends]
+    straight, rads = _edge_connection_rads(starts, ends, sy, ey)
+
+    # Curved arrows as bare patches (annotate's text machinery is unused with an
+    # empty label); one connection style string per distinct radius.
+    connection_styles = {}
+    for start, end, rad in zip(starts[~straight], ends[~straight], rads[~straight]):
+        conn = connection_styles.get(rad)
+        if conn is None:
+            conn = connection_styles[rad] = f"arc3,rad={float(rad)}"
+        ax.add_patch(
+            FancyArrowPatch(
+                (node_x[start], node_y[start]),
+                (node_x[end], node_y[end]),
+                arrowstyle="->",
+                connectionstyle=conn,
+                mutation_scale=10,
+                zorder=3,
+                clip_on=False,
+            )
+        )
 
-    for start, end in edges:
-        if start >= len(flow_seq) or end >= len(flow_seq):
-            continue
-        sx, sy = node_positions[start]
-        ex, ey = node_positions[end]
-        connection_style = _connection_style(start, end, sy, ey)
-        ax.annotate(
-            "",
-            xy=(ex, ey),
-            xytext=(sx, sy),
-            arrowprops=dict(arrowstyle="->", connectionstyle=connection_style),
+    if straight.any():
+        segments = _straight_arrow_segments(
+            np.column_stack((node_x[starts[straight]], sy[straight])),
+            np.column_stack((node_x[ends[straight]], ey[straight])),
+        )
+        ax.add_collection(
+            LineCollection(
+                segments,
+                colors="black",
+                linewidths=_ARROW_LINEWIDTH_PT,
+                capstyle="round",
+                joinstyle="round",
+            )
         )
 
-    pdf.savefig(fig)
-    plt.close(fig)
+    pdf.savefig(ax.figure)
+
+
+# Fixed document info dict, written once when the PDF is finalized
+_PDF_METADATA = {"Title": "SBP", "Creator": "sbpgen"}
+
+
+def _nonblank_lines(lines):
+    # Yield stripped, non-empty lines lazily so input is parsed as it is read
+    for line in lines:
+        stripped = line.strip()
+        if stripped:
+            yield stripped
 
 
 def main():
@@ -341,6 +489,12 @@ def main():
     matplotlib.rcParams["pdf.fonttype"] = 42
     matplotlib.rcParams["ps.fonttype"] = 42
     matplotlib.rcParams["pdf.use14corefonts"] = False
+    # Pin Matplotlib's default path simplification (ignoring user rc). It only
+    # applies to long straight-segment paths; current pages draw none of those.
+    matplotlib.rcParams["path.simplify"] = True
+    # Save the full fixed-margin page; a user rc 'tight' bbox would re-render each
+    # page to measure it and crop away the margins.
+    matplotlib.rcParams["savefig.bbox"] = "standard"
 
     # Apply platform-specific default family fallbacks
     families = []
@@ -364,13 +518,20 @@ def main():
     current = matplotlib.rcParams.get("font.sans-serif", [])
     matplotlib.rcParams["font.sans-serif"] = families + list(current)
 
-    with open(infile, "r", encoding="utf-8") as f:
-        lines = [line.strip() for line in f if line.strip()]
-
-    with PdfPages(outfile) as pdf:
-        for line in lines:
-            step, flow_seq, act_seq, edges = parse_line(line)
-            draw_page(pdf, step, flow_seq, act_seq, edges)
+    # One FontProperties shared by every page (a list, since a bare family string
+    # is parsed as a fontconfig pattern)
+    font_prop = fm.FontProperties(family=["sans-serif"])
+
+    fig, ax = _new_page_figure()
+    try:
+        with open(infile, "r", encoding="utf-8") as f, PdfPages(
+            outfile, metadata=_PDF_METADATA
+        ) as pdf:
+            for line in _nonblank_lines(f):
+                step, flow_seq, act_seq, edges = parse_line(line)
+                draw_page(pdf, ax, step, flow_seq, act_seq, edges, font_prop=font_prop)
+    finally:
+        plt.close(fig)
 
     print(f"Saved: {outfile}")
 
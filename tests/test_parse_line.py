@@ -38,3 +38,51 @@ def test_pipe_separator_suppresses_edge():
     assert act_seq == ["First", "Second", "Third"]
     assert (0, 1) not in edges
     assert (1, 2) in edges
+
+
+def test_full_width_input_is_normalized_before_parsing():
+    step, flow_seq, act_seq, edges = parse_line("手順：Ｃ 注文→Ｆ 受付／Ｂ 処理")
+
+    assert step == "手順"
+    assert flow_seq == ["C", "F", "B"]
+    assert act_seq == ["注文", "受付", "処理"]
+    assert edges == [(0, 1), (1, 2)]
+
+
+def test_malformed_separators_raise_actionable_errors():
+    cases = {
+        "Step:C First///F Second": "Missing role/action",
+        "Step:C First/|F Second": "Missing role/action",
+        "Step:|C First": "Missing role/action",
+        "Step:C First/": "must end with a role/action segment",
+        "Step:C First//": "must end with a role/action segment",
+        "Step:C First|": "must end with a role/action segment",
+    }
+    for line, message in cases.items():
+        try:
+            parse_line(line)
+        except ValueError as exc:
+            assert message in str(exc), line
+        else:
+            raise AssertionError(f"Expected ValueError for {line!r}")
+
+
+def test_legacy_csv_normalizes_role_aliases_and_arrows():
+    step, flow_seq, act_seq, edges = parse_line(
+        "Checkout, Customer→Frontstage－Back—Proc, Pay→Confirm>Reserve>Log"
+    )
+
+    assert step == "Checkout"
+    assert flow_seq == ["C", "F", "B", "P"]
+    assert act_seq == ["Pay", "Confirm", "Reserve", "Log"]
+    assert edges == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_legacy_csv_keeps_commas_inside_actions():
+    step, flow_seq, act_seq, edges = parse_line(
+        "Pay,C>F,Enter card, then confirm>Charge"
+    )
+
+    assert step == "Pay"
+    assert flow_seq == ["C", "F"]
+    assert act_seq == ["Enter card, then confirm", "Charge"]
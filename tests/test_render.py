@@ -0,0 +1,57 @@
+import re
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+import sbpgen
+from sbpgen import _new_page_figure, draw_page, parse_line
+
+EXAMPLE = (
+    "Add to Cart:C Click Cart/F Add to Cart/B Update Inventory//P Check DB"
+    "|B Reflect Remaining/P Log Record\n"
+    "\n"
+    "Example Step 1:C Action1/F Action2/B Action3/P Action4/B Action5\n"
+    "Pay,C>F,Enter card>Charge\n"
+)
+
+
+def test_main_writes_one_page_per_nonblank_line_with_fixed_metadata(
+    tmp_path, monkeypatch
+):
+    infile = tmp_path / "in.txt"
+    infile.write_text(EXAMPLE, encoding="utf-8")
+    outfile = tmp_path / "out.pdf"
+    monkeypatch.setattr(sys, "argv", ["sbpgen.py", str(infile), str(outfile)])
+
+    with matplotlib.rc_context():
+        sbpgen.main()
+
+    data = outfile.read_bytes()
+    assert len(re.findall(rb"/Type /Page\b", data)) == 3
+    assert b"/Title (SBP)" in data
+    assert b"/Creator (sbpgen)" in data
+
+
+def test_reused_axes_only_holds_current_page_artists(tmp_path):
+    fig, ax = _new_page_figure()
+    try:
+        with PdfPages(tmp_path / "out.pdf") as pdf:
+            draw_page(pdf, ax, *parse_line(EXAMPLE.splitlines()[0]))
+            assert len(ax.patches) == 1  # curved '//' branch arrow
+
+            draw_page(pdf, ax, *parse_line("Step:C First/F Second"))
+            assert pdf.get_pagecount() == 2
+    finally:
+        plt.close(fig)
+
+    # Title, recap, four lane labels and two action labels
+    assert len(ax.texts) == 8
+    # Four lane lines, the node scatter and the straight-arrow collection
+    assert len(ax.collections) == 6
+    assert len(ax.patches) == 0
+    assert ax.collections[4].get_offsets().shape == (2, 2)